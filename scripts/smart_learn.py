@@ -22,35 +22,66 @@ Usage:
 import os
 import sys
 import argparse
-import yaml
+import importlib
 import json
 import re
 import subprocess
 import base64
+import random
+import sqlite3
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, List, Dict, Tuple, Union
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, as_completed, wait)
+from functools import lru_cache
+from html import escape as html_escape
+from string import Template
 import hashlib
 
-# Third-party imports
+# Heavy third-party imports (openai, PyMuPDF, PyPDF2, yaml) are loaded lazily
+# inside the functions that need them so commands like --list and --search
+# don't pay their startup cost
+def _ensure(pip_name: str, import_name: str = None):
+    """Import a module on first use, pip-installing it if missing"""
+    name = import_name or pip_name
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        subprocess.run([sys.executable, "-m", "pip", "install", pip_name, "--break-system-packages", "-q"])
+        return importlib.import_module(name)
+
+
+# Optional: token-accurate chunking (falls back to character counts)
 try:
-    from openai import OpenAI
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
 except ImportError:
-    subprocess.run([sys.executable, "-m", "pip", "install", "openai", "--break-system-packages", "-q"])
-    from openai import OpenAI
+    TIKTOKEN_AVAILABLE = False
 
+# Optional: fastest non-cryptographic hash for section IDs
 try:
-    import PyPDF2
+    import xxhash
+    XXHASH_AVAILABLE = True
 except ImportError:
-    subprocess.run([sys.executable, "-m", "pip", "install", "PyPDF2", "--break-system-packages", "-q"])
-    import PyPDF2
+    XXHASH_AVAILABLE = False
 
+
+# Optional: faster JSON decoding for multi-KB LLM responses
 try:
-    import fitz  # PyMuPDF for better PDF handling
+    import orjson
+    _loads = orjson.loads
 except ImportError:
-    subprocess.run([sys.executable, "-m", "pip", "install", "PyMuPDF", "--break-system-packages", "-q"])
-    import fitz
+    _loads = json.loads
+
+
+def fast_hash(data: str) -> str:
+    """Short non-cryptographic hex digest for HTML element IDs"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh64(data.encode()).hexdigest()[:8]
+    return hashlib.blake2b(data.encode(), digest_size=4).hexdigest()
 
 # Configuration
 CONFIG_PATH = "/Users/abhishtbagewadi/Documents/Scripts/RCA-SCRIPT-2/abhisht_script_github_ready/config/config.yaml"
@@ -62,6 +93,305 @@ TOPICS_DIR = REPO_PATH / "topics"
 CHUNK_SIZE = 6000
 MAX_CHUNKS_PER_BATCH = 5
 
+# Files above this size are streamed into the chunker instead of read whole
+STREAM_MIN_BYTES = 50 * 1024 * 1024
+
+# How many OpenAI requests to keep in flight at once (each one is network-bound)
+MAX_CONCURRENT_REQUESTS = 10
+
+# Generation budget per chunk analysis; sized to the JSON schema, not the context
+ANALYSIS_MAX_TOKENS = 800
+
+# HTTP statuses worth retrying with backoff
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Markdown fences the model sometimes wraps JSON in; compiled once, not per response
+_JSON_FENCE_PREFIX = re.compile(r'^```json?\n?')
+_JSON_FENCE_SUFFIX = re.compile(r'\n?```$')
+
+
+def _strip_json_fences(response_text: str) -> str:
+    """Drop optional ```json fences; skips regex work entirely for clean responses"""
+    if response_text.startswith("```"):
+        response_text = _JSON_FENCE_SUFFIX.sub("", _JSON_FENCE_PREFIX.sub("", response_text))
+    return response_text
+
+
+def chat_with_backoff(client, max_retries: int = 4, **kwargs):
+    """Call chat.completions.create with exponential backoff on rate limits / 5xx"""
+    for attempt in range(max_retries):
+        try:
+            return client.chat.completions.create(**kwargs)
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            if status not in _RETRY_STATUS or attempt == max_retries - 1:
+                raise
+            delay = min(2 ** attempt, 30) + random.uniform(0, 1)
+            print(f"   ⏳ API busy ({status}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+# Response cache for chunk analysis: exact hits by content hash, fuzzy hits by
+# embedding similarity (re-ingesting an edited PDF mostly re-sends old chunks).
+# Lives under ~/.cache rather than REPO_PATH so the publish flow's `git add -A`
+# never commits raw LLM responses and embeddings to the public repo
+CACHE_DIR = Path.home() / ".cache" / "smart_learn"
+CACHE_DB = CACHE_DIR / "analysis_cache.db"
+SEMANTIC_SIM_THRESHOLD = 0.95
+
+try:
+    import numpy as np
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+_embedder = None
+_embedding_keys = None    # list of (key, topic) mirrored from the DB
+_embedding_matrix = None  # float32 matrix of L2-normalized embeddings, same order
+_cache_lock = threading.Lock()
+
+
+def _cache_conn():
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS analysis_cache "
+        "(key TEXT PRIMARY KEY, topic TEXT, embedding BLOB, response TEXT)"
+    )
+    return conn
+
+
+def _embed_chunk(chunk: str):
+    """Embed a chunk locally (CPU-cheap compared to an LLM call)"""
+    global _embedder
+    if not SEMANTIC_CACHE_AVAILABLE:
+        return None
+    try:
+        with _cache_lock:
+            if _embedder is None:
+                from sentence_transformers import SentenceTransformer
+                _embedder = SentenceTransformer('all-MiniLM-L6-v2')
+        vec = _embedder.encode(chunk)
+        return np.asarray(vec, dtype=np.float32)
+    except Exception:
+        return None
+
+
+def _normalize(vec):
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def _load_embedding_index():
+    """Load cached embeddings once as a contiguous normalized matrix"""
+    global _embedding_keys, _embedding_matrix
+    with _cache_lock:
+        if _embedding_keys is None:
+            _embedding_keys = []
+            vectors = []
+            try:
+                conn = _cache_conn()
+                rows = conn.execute(
+                    "SELECT key, topic, embedding FROM analysis_cache WHERE embedding IS NOT NULL"
+                ).fetchall()
+                conn.close()
+                for key, topic, blob in rows:
+                    _embedding_keys.append((key, topic))
+                    vectors.append(np.frombuffer(blob, dtype=np.float32))
+            except Exception:
+                pass
+            if vectors:
+                _embedding_matrix = np.vstack(vectors)
+                norms = np.linalg.norm(_embedding_matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                _embedding_matrix = _embedding_matrix / norms
+    return _embedding_keys, _embedding_matrix
+
+
+def _cache_lookup_exact(key: str) -> Optional[dict]:
+    try:
+        conn = _cache_conn()
+        row = conn.execute("SELECT response FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        return _loads(row[0]) if row else None
+    except Exception:
+        return None
+
+
+def _cache_lookup_semantic(topic: str, query) -> Optional[dict]:
+    """Return a cached response whose chunk embedding is near-identical to the query.
+
+    All similarities are computed in one BLAS matrix-vector product against the
+    pre-normalized embedding matrix, so lookups stay in microseconds even with
+    a large cache."""
+    keys, matrix = _load_embedding_index()
+    if matrix is None or not keys:
+        return None
+    qnorm = np.linalg.norm(query)
+    if qnorm == 0:
+        return None
+
+    sims = matrix @ (query / qnorm)
+
+    best_key = None
+    best_sim = 0.0
+    for idx in np.flatnonzero(sims >= SEMANTIC_SIM_THRESHOLD):
+        key, cached_topic = keys[idx]
+        if cached_topic == topic and sims[idx] > best_sim:
+            best_key, best_sim = key, float(sims[idx])
+    return _cache_lookup_exact(best_key) if best_key else None
+
+
+def _cache_store(key: str, topic: str, embedding, response: dict):
+    try:
+        conn = _cache_conn()
+        blob = embedding.tobytes() if embedding is not None else None
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_cache (key, topic, embedding, response) VALUES (?, ?, ?, ?)",
+            (key, topic, blob, json.dumps(response))
+        )
+        conn.commit()
+        conn.close()
+        if embedding is not None and _embedding_keys is not None:
+            with _cache_lock:
+                global _embedding_matrix
+                _embedding_keys.append((key, topic))
+                row = _normalize(np.asarray(embedding, dtype=np.float32))
+                if _embedding_matrix is None:
+                    _embedding_matrix = row.reshape(1, -1)
+                else:
+                    _embedding_matrix = np.vstack([_embedding_matrix, row])
+    except Exception:
+        pass
+
+
+def analyze_chunk_batch(client, batch: List[str], topic: str) -> List[Optional[dict]]:
+    """Analyze several chunks with a single API round-trip; returns one dict (or None) per chunk"""
+    topic_info = DEVOPS_TOPICS.get(topic, {"name": topic.replace("-", " ").title()})
+    numbered = "\n\n".join(f"[CHUNK {i+1}]\n{c}" for i, c in enumerate(batch))
+
+    prompt = f"""Extract learning content for a {topic_info['name']} knowledge base from each of the {len(batch)} chunks below.
+
+{numbered}
+
+RESPOND IN JSON FORMAT:
+{{
+    "results": [
+        {{
+            "title": "Clear section title",
+            "summary": "2-3 sentence summary of the chunk",
+            "key_points": ["point 1", "point 2"],
+            "code_examples": [
+                {{"description": "what it does", "language": "bash/yaml/python", "code": "the code"}}
+            ],
+            "commands": [
+                {{"command": "the command", "description": "what it does"}}
+            ],
+            "tips": ["practical tip 1"],
+            "best_practices": ["practice 1"]
+        }}
+    ]
+}}
+
+Return exactly one object per chunk, in the same order as the chunks.
+If a chunk has no useful content, return an empty object {{}} for it."""
+
+    try:
+        response = chat_with_backoff(
+            client,
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You extract learning content and format it as JSON. Always respond with valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.2,
+            max_tokens=ANALYSIS_MAX_TOKENS * len(batch),
+            response_format={"type": "json_object"}
+        )
+        parsed = _loads(response.choices[0].message.content.strip())
+        raw_results = parsed.get("results", [])
+    except Exception as e:
+        print(f"   ⚠️ Batch analysis error: {e}")
+        return [None] * len(batch)
+
+    results = []
+    for i in range(len(batch)):
+        r = raw_results[i] if i < len(raw_results) else None
+        if r and (r.get("title") or r.get("summary") or r.get("key_points")):
+            results.append(r)
+        else:
+            results.append(None)
+    return results
+
+
+def analyze_chunks_batched(client, chunks: Iterable[str], topic: str,
+                           batch_size: int = MAX_CHUNKS_PER_BATCH,
+                           max_workers: int = MAX_CONCURRENT_REQUESTS) -> List[dict]:
+    """
+    Pack several chunks into each OpenAI request so HTTP overhead and prompt
+    boilerplate are amortized across the batch, and run batches concurrently.
+    Cached chunks (exact or near-duplicate) are filled in without any API call.
+    Chunks are consumed lazily with a bounded number of batches in flight, so
+    peak memory for streamed files stays near the in-flight window instead of
+    the whole document.
+    """
+    ordered: List[Optional[dict]] = []
+    pending = []  # (index, chunk, embedding) triples that missed both cache tiers
+    futures = {}  # in-flight batch future -> its triples
+    cached = 0
+    done = 0
+
+    def harvest(completed):
+        nonlocal done
+        for future in completed:
+            batch = futures.pop(future)
+            done += 1
+            print(f"   Analyzed batch {done}...", end="\r")
+            try:
+                batch_results = future.result()
+            except Exception as e:
+                print(f"   ⚠️ Batch failed: {e}")
+                continue
+            for (idx, chunk, embedding), result in zip(batch, batch_results):
+                if result:
+                    ordered[idx] = result
+                    key = hashlib.sha256((topic + chunk).encode()).hexdigest()
+                    _cache_store(key, topic, embedding, result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, chunk in enumerate(chunks):
+            key = hashlib.sha256((topic + chunk).encode()).hexdigest()
+            hit = _cache_lookup_exact(key)
+            embedding = None
+            if hit is None:
+                embedding = _embed_chunk(chunk)
+                if embedding is not None:
+                    hit = _cache_lookup_semantic(topic, embedding)
+            ordered.append(hit)
+            if hit is not None:
+                cached += 1
+                continue
+            pending.append((i, chunk, embedding))
+            if len(pending) >= batch_size:
+                futures[executor.submit(
+                    analyze_chunk_batch, client, [c for _, c, _ in pending], topic
+                )] = pending
+                pending = []
+            # Backpressure: stop pulling chunks once the pool is saturated
+            if len(futures) >= max_workers * 2:
+                completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+                harvest(completed)
+        if pending:
+            futures[executor.submit(
+                analyze_chunk_batch, client, [c for _, c, _ in pending], topic
+            )] = pending
+        harvest(as_completed(list(futures)))
+
+    if cached:
+        print(f"   ♻️ {cached} chunks served from cache")
+    return [r for r in ordered if r]
+
+
 # DevOps Topics for categorization (can be extended dynamically)
 DEVOPS_TOPICS = {
     "git": {"name": "Git & GitHub", "icon": "🔀", "color": "#f05032"},
@@ -101,6 +431,13 @@ NEW_TOPIC_COLORS = [
 # Icons for new topics (will cycle through)
 NEW_TOPIC_ICONS = ["📖", "💡", "🔧", "⚙️", "🛠️", "📦", "🎯", "✨", "🔥", "💻"]
 
+# Reverse lookup: normalized display name -> topic key, so exact name matches
+# are a dict hit instead of a scan over every topic
+_NAME_INDEX = {
+    info["name"].lower().replace(" ", "-"): key
+    for key, info in DEVOPS_TOPICS.items()
+}
+
 
 def find_or_create_topic(topic_input: str) -> str:
     """
@@ -114,6 +451,12 @@ def find_or_create_topic(topic_input: str) -> str:
         print(f"   ✅ Found existing topic: {DEVOPS_TOPICS[topic_input]['name']}")
         return topic_input
 
+    # Exact display-name match ("github-actions" vs "GitHub Actions")
+    if topic_input in _NAME_INDEX:
+        key = _NAME_INDEX[topic_input]
+        print(f"   ✅ Matched to existing topic: {DEVOPS_TOPICS[key]['name']}")
+        return key
+
     # Check for partial match (topic contains input or input contains topic)
     for key, info in DEVOPS_TOPICS.items():
         if topic_input in key or key in topic_input:
@@ -141,124 +484,102 @@ def find_or_create_topic(topic_input: str) -> str:
         "icon": icon,
         "color": color
     }
+    _NAME_INDEX[display_name.lower().replace(" ", "-")] = topic_input
 
     print(f"   {icon} New topic created: {display_name}")
     return topic_input
 
 
-def process_for_specific_topic(client: OpenAI, content: str, topic: str) -> Dict[str, List[dict]]:
-    """Process content for a specific topic (skip auto-detection)"""
-
-    print(f"\n📊 Content size: {len(content):,} characters")
+def process_for_specific_topic(client, content: Union[str, Iterable[str]], topic: str,
+                               max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, List[dict]]:
+    """Process content (raw text or a page stream) for a specific topic (skip auto-detection)"""
 
     topic_info = DEVOPS_TOPICS.get(topic, DEVOPS_TOPICS["misc"])
     print(f"🎯 Target topic: {topic_info['icon']} {topic_info['name']}")
 
-    # Chunk the content
-    chunks = chunk_content(content)
-    print(f"📦 Split into {len(chunks)} chunks")
-
-    # Process all chunks for this specific topic
-    results = {topic: []}
-
+    # Process all chunks for this specific topic (batched + concurrent requests);
+    # the chunk iterator is consumed lazily, never materialized up front
     print(f"\n🔄 Processing all content for {topic_info['name']}...")
 
-    for i, chunk in enumerate(chunks):
-        print(f"   Analyzing chunk {i+1}/{len(chunks)}...", end="\r")
-        analysis = analyze_chunk_for_topic(client, chunk, topic)
-        if analysis:
-            results[topic].append(analysis)
+    results = {topic: analyze_chunks_batched(client, as_chunks(content), topic,
+                                             max_workers=max_workers)}
 
     print(f"   ✅ Extracted {len(results[topic])} sections for {topic_info['name']}")
 
     return results
 
 
-def analyze_chunk_for_topic(client: OpenAI, chunk: str, target_topic: str) -> Optional[dict]:
-    """Analyze chunk and extract content for specific topic (always relevant)"""
-
-    topic_info = DEVOPS_TOPICS.get(target_topic, {"name": target_topic.replace("-", " ").title()})
-
-    prompt = f"""Extract learning content from this text and format it for a {topic_info['name']} knowledge base.
-
-CONTENT:
-{chunk}
-
-RESPOND IN JSON FORMAT:
-{{
-    "title": "Clear section title",
-    "summary": "2-3 sentence summary of the content",
-    "key_points": ["point 1", "point 2", "point 3"],
-    "code_examples": [
-        {{"description": "what it does", "language": "bash/yaml/python", "code": "the code"}}
-    ],
-    "commands": [
-        {{"command": "the command", "description": "what it does"}}
-    ],
-    "tips": ["practical tip 1", "practical tip 2"],
-    "best_practices": ["practice 1", "practice 2"]
-}}
-
-Extract all useful information. If no code/commands exist, use empty arrays."""
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You extract learning content and format it as JSON. Always respond with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
-        )
-
-        response_text = response.choices[0].message.content.strip()
-        response_text = re.sub(r'^```json?\n?', '', response_text)
-        response_text = re.sub(r'\n?```$', '', response_text)
-
-        result = json.loads(response_text)
-        # Always return result for specific topic mode (no relevance check)
-        if result.get("title") or result.get("summary") or result.get("key_points"):
-            return result
-    except Exception as e:
-        print(f"   ⚠️ Chunk analysis error: {e}")
-
-    return None
-
-
+@lru_cache(maxsize=1)
 def load_config() -> dict:
-    """Load configuration from YAML file"""
+    """Load configuration from YAML file (parsed once per process)"""
+    yaml = _ensure("pyyaml", "yaml")
     with open(CONFIG_PATH, 'r') as f:
         return yaml.safe_load(f)
 
 
-def get_openai_client() -> OpenAI:
-    """Initialize OpenAI client"""
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """Initialize OpenAI client (one shared instance per process)"""
+    openai = _ensure("openai")
     config = load_config()
-    return OpenAI(api_key=config['openai']['api_key'])
+    return openai.OpenAI(api_key=config['openai']['api_key'])
+
+
+# Page extraction is CPU-bound inside MuPDF, so large PDFs are split across
+# worker processes; small ones stay serial to avoid process-spawn overhead
+PDF_PAGES_PER_WORKER = 32
+PDF_PARALLEL_MIN_PAGES = 16
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """Worker: open the PDF independently and extract a contiguous page range"""
+    fitz = _ensure("PyMuPDF", "fitz")
+    doc = fitz.open(file_path)
+    texts = [doc[i].get_text() for i in range(start, end)]
+    doc.close()
+    return texts
 
 
 def extract_pdf_content(file_path: str) -> str:
     """Extract text from PDF using PyMuPDF (handles large files better)"""
+    fitz = _ensure("PyMuPDF", "fitz")
     content = []
     try:
         doc = fitz.open(file_path)
         total_pages = len(doc)
         print(f"   📄 Processing {total_pages} pages...")
 
-        for i, page in enumerate(doc):
-            text = page.get_text()
+        if total_pages >= PDF_PARALLEL_MIN_PAGES:
+            ranges = [(i, min(i + PDF_PAGES_PER_WORKER, total_pages))
+                      for i in range(0, total_pages, PDF_PAGES_PER_WORKER)]
+            results_by_start = {}
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = {
+                    executor.submit(_extract_page_range, file_path, s, e): s
+                    for s, e in ranges
+                }
+                done_pages = 0
+                for future in as_completed(futures):
+                    start = futures[future]
+                    results_by_start[start] = future.result()
+                    done_pages += len(results_by_start[start])
+                    print(f"   📖 Processed {done_pages}/{total_pages} pages...")
+            page_texts = []
+            for s, _ in ranges:
+                page_texts.extend(results_by_start[s])
+        else:
+            page_texts = [page.get_text() for page in doc]
+
+        for i, text in enumerate(page_texts):
             if text:
                 content.append(f"\n--- Page {i+1} ---\n{text}")
 
-            # Progress indicator for large files
-            if total_pages > 10 and (i + 1) % 10 == 0:
-                print(f"   📖 Processed {i+1}/{total_pages} pages...")
-
         doc.close()
     except Exception as e:
         print(f"   ⚠️ PyMuPDF failed, trying PyPDF2: {e}")
         # Fallback to PyPDF2
         try:
+            PyPDF2 = _ensure("PyPDF2")
             with open(file_path, 'rb') as f:
                 reader = PyPDF2.PdfReader(f)
                 for i, page in enumerate(reader.pages):
@@ -272,8 +593,24 @@ def extract_pdf_content(file_path: str) -> str:
     return "\n".join(content)
 
 
-def read_file_content(file_path: str) -> Tuple[str, str]:
-    """Read content from various file types. Returns (content, file_type)"""
+def iter_text_lines(file_path: str) -> Iterator[str]:
+    """Yield a text file line-by-line for streaming ingestion.
+
+    Line terminators are stripped; iter_chunks re-adds one "\\n" per piece
+    when joining, so blank lines still come through as paragraph breaks."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line.rstrip('\n')
+    except UnicodeDecodeError:
+        with open(file_path, 'r', encoding='latin-1') as f:
+            for line in f:
+                yield line.rstrip('\n')
+
+
+def read_file_content(file_path: str) -> Tuple[Union[str, Iterable[str]], str]:
+    """Read content from various file types. Returns (content, file_type);
+    content is a page/line iterator for files above STREAM_MIN_BYTES."""
     path = Path(file_path)
 
     if not path.exists():
@@ -286,12 +623,17 @@ def read_file_content(file_path: str) -> Tuple[str, str]:
     print(f"   📁 File size: {file_size / 1024 / 1024:.2f} MB")
 
     if suffix == '.pdf':
+        # Very large PDFs stream page-by-page; smaller ones use the parallel extractor
+        if file_size > STREAM_MIN_BYTES:
+            return iter_pdf_pages(file_path), 'pdf'
         return extract_pdf_content(file_path), 'pdf'
     elif suffix in ['.png', '.jpg', '.jpeg', '.gif', '.webp']:
         # For images, we'll use vision API
         return read_image_content(file_path), 'image'
     else:
-        # Text-based files - handle large files
+        # Text-based files - stream the huge ones, read the rest at once
+        if file_size > STREAM_MIN_BYTES:
+            return iter_text_lines(file_path), 'text'
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 return f.read(), 'text'
@@ -300,9 +642,9 @@ def read_file_content(file_path: str) -> Tuple[str, str]:
                 return f.read(), 'text'
 
 
-def read_image_content(file_path: str) -> str:
+def read_image_content(file_path: str, client=None) -> str:
     """Extract text from image using OpenAI Vision"""
-    client = get_openai_client()
+    client = client or get_openai_client()
 
     with open(file_path, 'rb') as f:
         image_data = base64.b64encode(f.read()).decode('utf-8')
@@ -342,166 +684,262 @@ def read_image_content(file_path: str) -> str:
     return response.choices[0].message.content
 
 
-def chunk_content(content: str, chunk_size: int = CHUNK_SIZE) -> List[str]:
-    """Split large content into manageable chunks"""
-    if len(content) <= chunk_size:
-        return [content]
+# Token budget per chunk when tiktoken is available (~CHUNK_SIZE chars of prose)
+CHUNK_TOKENS = 1500
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+    return _encoding
 
+
+def _chunk_by_tokens(content: str) -> List[str]:
+    """Single pass over token offsets; chunks fully use the model's token budget"""
+    enc = _get_encoding()
+    tokens = enc.encode(content)
+    chunks = []
+    i = 0
+    while i < len(tokens):
+        end = min(i + CHUNK_TOKENS, len(tokens))
+        if end < len(tokens):
+            # Walk back up to 200 tokens to the nearest paragraph break
+            for j in range(end, max(i + 1, end - 200), -1):
+                if '\n\n' in enc.decode(tokens[j - 1:j + 1]):
+                    end = j
+                    break
+        chunks.append(enc.decode(tokens[i:end]))
+        i = end
+    return chunks
+
+
+def _chunk_by_chars(content: str, chunk_size: int) -> List[str]:
+    """Single-pass character-count splitter on paragraph boundaries"""
     chunks = []
-    # Try to split on paragraph boundaries
-    paragraphs = content.split('\n\n')
-    current_chunk = ""
+    parts: List[str] = []
+    size = 0
+
+    for para in content.split('\n\n'):
+        piece = para + "\n\n"
+        if size + len(piece) > chunk_size and parts:
+            chunks.append("".join(parts).strip())
+            parts, size = [], 0
+        if len(piece) > chunk_size:
+            # Paragraph alone exceeds the budget: hard-split it
+            for i in range(0, len(para), chunk_size):
+                chunks.append(para[i:i + chunk_size])
+            continue
+        parts.append(piece)
+        size += len(piece)
 
-    for para in paragraphs:
-        if len(current_chunk) + len(para) < chunk_size:
-            current_chunk += para + "\n\n"
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = para + "\n\n"
-
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-
-    # If paragraphs are too long, force split
-    final_chunks = []
-    for chunk in chunks:
-        if len(chunk) > chunk_size:
-            for i in range(0, len(chunk), chunk_size):
-                final_chunks.append(chunk[i:i+chunk_size])
-        else:
-            final_chunks.append(chunk)
+    if parts:
+        chunks.append("".join(parts).strip())
 
-    return final_chunks
+    return chunks
 
 
-def analyze_content_for_topics(client: OpenAI, content: str) -> List[str]:
-    """First pass: Identify all topics present in the content"""
+def chunk_content(content: str, chunk_size: int = CHUNK_SIZE) -> List[str]:
+    """Split large content into chunks sized to the model's context budget"""
+    if len(content) <= chunk_size:
+        return [content]
 
-    topics_list = ", ".join(DEVOPS_TOPICS.keys())
+    if TIKTOKEN_AVAILABLE:
+        return _chunk_by_tokens(content)
+    return _chunk_by_chars(content, chunk_size)
 
-    # Use a sample of content for topic detection
-    sample = content[:10000] if len(content) > 10000 else content
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",  # Faster for topic detection
-        messages=[
-            {
-                "role": "system",
-                "content": "You identify DevOps topics in content. Respond with ONLY a JSON array of topic keys."
-            },
-            {
-                "role": "user",
-                "content": f"""Identify ALL DevOps topics present in this content.
+def iter_pdf_pages(file_path: str) -> Iterator[str]:
+    """Yield page texts one at a time so huge PDFs never fully materialize in RAM"""
+    fitz = _ensure("PyMuPDF", "fitz")
+    doc = fitz.open(file_path)
+    try:
+        for page in doc:
+            text = page.get_text()
+            if text:
+                yield text
+    finally:
+        doc.close()
 
-AVAILABLE TOPICS: {topics_list}
 
-CONTENT:
-{sample}
+def iter_chunks(text_iter: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Stream text pieces (e.g. PDF pages) into chunks, flushing at the nearest
+    paragraph break. Peak memory stays around one chunk regardless of input size.
+    """
+    buf: List[str] = []
+    size = 0
+    for piece in text_iter:
+        buf.append(piece)
+        size += len(piece) + 1
+        if size < chunk_size:
+            continue
+        while True:
+            text = "\n".join(buf)
+            if len(text) < chunk_size:
+                buf, size = [text], len(text)
+                break
+            cut = text.rfind('\n\n', 0, chunk_size)
+            if cut <= 0:
+                cut = chunk_size
+            chunk = text[:cut].strip()
+            if chunk:
+                yield chunk
+            buf = [text[cut:]]
 
-Respond with ONLY a JSON array of matching topic keys, e.g.: ["kubernetes", "docker", "helm"]
-If content doesn't match any specific topic, use ["misc"]"""
-            }
-        ],
-        temperature=0.1
-    )
+    tail = "\n".join(buf).strip()
+    if tail:
+        yield tail
 
-    response_text = response.choices[0].message.content.strip()
 
-    # Clean and parse
-    response_text = re.sub(r'^```json?\n?', '', response_text)
-    response_text = re.sub(r'\n?```$', '', response_text)
+def as_chunks(content: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Chunk either raw text or a stream of text pieces, lazily"""
+    if isinstance(content, str):
+        return iter(chunk_content(content))
+    return iter_chunks(content)
 
-    try:
-        topics = json.loads(response_text)
-        # Validate topics
-        valid_topics = [t for t in topics if t in DEVOPS_TOPICS]
-        return valid_topics if valid_topics else ["misc"]
-    except:
-        return ["misc"]
 
+def analyze_chunk_multi(client, chunk: str, candidate_topics: List[str]) -> Dict[str, dict]:
+    """Analyze a chunk once for every candidate topic in a single API call.
 
-def analyze_chunk(client: OpenAI, chunk: str, target_topic: str) -> Optional[dict]:
-    """Analyze a single chunk of content for a specific topic"""
+    Replaces the old two-pass flow (sample-based topic detection followed by one
+    call per topic per chunk): a chunk covering several topics now costs one
+    request instead of one per topic."""
 
-    topic_info = DEVOPS_TOPICS.get(target_topic, DEVOPS_TOPICS["misc"])
+    cache_topic = "multi:" + ",".join(sorted(candidate_topics))
+    key = hashlib.sha256((cache_topic + chunk).encode()).hexdigest()
+    hit = _cache_lookup_exact(key)
+    if hit is not None:
+        return hit
 
-    prompt = f"""Analyze this content and extract information related to {topic_info['name']}.
+    embedding = _embed_chunk(chunk)
+    if embedding is not None:
+        hit = _cache_lookup_semantic(cache_topic, embedding)
+        if hit is not None:
+            return hit
+
+    topics_list = ", ".join(f"{k} ({DEVOPS_TOPICS[k]['name']})" for k in candidate_topics)
+
+    prompt = f"""Analyze this content. For each topic from the list that is actually present, extract learning content.
+
+AVAILABLE TOPICS: {topics_list}
 
 CONTENT:
 {chunk}
 
-RESPOND IN JSON FORMAT:
+RESPOND IN JSON FORMAT - an object keyed by topic id, with one entry per topic present:
 {{
-    "relevant": true/false,
-    "title": "Section title if relevant",
-    "summary": "2-3 sentence summary",
-    "key_points": ["point 1", "point 2"],
-    "code_examples": [
-        {{"description": "what it does", "language": "bash/yaml/python", "code": "the code"}}
-    ],
-    "commands": [
-        {{"command": "the command", "description": "what it does"}}
-    ],
-    "tips": ["tip 1", "tip 2"],
-    "best_practices": ["practice 1"]
+    "kubernetes": {{
+        "title": "Section title",
+        "summary": "2-3 sentence summary",
+        "key_points": ["point 1", "point 2"],
+        "code_examples": [
+            {{"description": "what it does", "language": "bash/yaml/python", "code": "the code"}}
+        ],
+        "commands": [
+            {{"command": "the command", "description": "what it does"}}
+        ],
+        "tips": ["tip 1"],
+        "best_practices": ["practice 1"]
+    }}
 }}
 
-If content is not relevant to {topic_info['name']}, set "relevant": false and leave other fields empty."""
+Omit topics that are not present. Use "misc" for useful content that matches no
+specific topic. If the chunk has no useful content at all, return {{}}."""
 
     try:
-        response = client.chat.completions.create(
+        response = chat_with_backoff(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You extract DevOps learning content. Respond with valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.2
+            temperature=0.2,
+            # One response budget per candidate topic, as the batched path
+            # budgets per chunk; unused headroom costs nothing, and 16384 is
+            # gpt-4o-mini's output ceiling. A flat 2x cap truncated mid-JSON
+            # on chunks spanning several topics, dropping the whole chunk
+            max_tokens=min(ANALYSIS_MAX_TOKENS * len(candidate_topics), 16384),
+            response_format={"type": "json_object"}
         )
 
-        response_text = response.choices[0].message.content.strip()
-        response_text = re.sub(r'^```json?\n?', '', response_text)
-        response_text = re.sub(r'\n?```$', '', response_text)
+        response_text = _strip_json_fences(response.choices[0].message.content.strip())
 
-        result = json.loads(response_text)
-        if result.get("relevant", False):
-            return result
+        result = {
+            topic: analysis for topic, analysis in _loads(response_text).items()
+            if topic in DEVOPS_TOPICS and isinstance(analysis, dict) and analysis
+        }
+        if result:
+            _cache_store(key, cache_topic, embedding, result)
+        return result
     except Exception as e:
         print(f"   ⚠️ Chunk analysis error: {e}")
 
-    return None
-
-
-def process_large_content(client: OpenAI, content: str) -> Dict[str, List[dict]]:
-    """Process large content, identify topics, and extract structured data"""
-
-    print(f"\n📊 Content size: {len(content):,} characters")
-
-    # Step 1: Identify all topics in the content
-    print("🔍 Detecting topics...")
-    topics = analyze_content_for_topics(client, content)
-    print(f"   Found topics: {', '.join(topics)}")
+    return {}
+
+
+def process_large_content(client, content: Union[str, Iterable[str]],
+                          max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, List[dict]]:
+    """Process large content (raw text or a page stream), extracting every topic in one pass"""
+
+    # One multi-topic analysis per chunk; the chunk iterator is consumed lazily
+    # with a bounded number of requests in flight, so peak memory for streamed
+    # files stays near the in-flight window instead of the whole document
+    print("🔄 Analyzing chunks across all topics...")
+    candidates = list(DEVOPS_TOPICS.keys())
+    ordered: List[Optional[Dict[str, dict]]] = []
+    futures = {}  # in-flight chunk future -> its index
+    done = 0
+
+    def harvest(completed):
+        nonlocal done
+        for future in completed:
+            idx = futures.pop(future)
+            done += 1
+            print(f"   Analyzed chunk {done}...", end="\r")
+            try:
+                ordered[idx] = future.result()
+            except Exception as e:
+                print(f"   ⚠️ Chunk {idx+1} failed: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, chunk in enumerate(as_chunks(content)):
+            ordered.append(None)
+            futures[executor.submit(analyze_chunk_multi, client, chunk, candidates)] = i
+            # Backpressure: stop pulling chunks once the pool is saturated
+            if len(futures) >= max_workers * 2:
+                completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+                harvest(completed)
+        harvest(as_completed(list(futures)))
+
+    print(f"📦 Processed {len(ordered)} chunks")
+
+    results: Dict[str, List[dict]] = {}
+    for per_chunk in ordered:
+        if not per_chunk:
+            continue
+        for topic, analysis in per_chunk.items():
+            results.setdefault(topic, []).append(analysis)
 
-    # Step 2: Chunk the content
-    chunks = chunk_content(content)
-    print(f"📦 Split into {len(chunks)} chunks")
+    for topic, sections in results.items():
+        print(f"   ✅ Found {len(sections)} relevant sections for {DEVOPS_TOPICS[topic]['name']}")
 
-    # Step 3: Process chunks for each topic
-    results = {topic: [] for topic in topics}
+    return results
 
-    for topic in topics:
-        topic_name = DEVOPS_TOPICS[topic]['name']
-        print(f"\n🔄 Processing for {topic_name}...")
 
-        for i, chunk in enumerate(chunks):
-            print(f"   Analyzing chunk {i+1}/{len(chunks)}...", end="\r")
-            analysis = analyze_chunk(client, chunk, topic)
-            if analysis:
-                results[topic].append(analysis)
+# Known topic/root HTML files, scanned once per process instead of re-globbing
+# the directories on every index rebuild
+@lru_cache(maxsize=1)
+def _scan_topic_files() -> set:
+    return set(TOPICS_DIR.glob("*.html")) if TOPICS_DIR.exists() else set()
 
-        print(f"   ✅ Found {len(results[topic])} relevant sections for {topic_name}")
 
-    return results
+@lru_cache(maxsize=1)
+def _scan_root_files() -> set:
+    return {p for p in REPO_PATH.glob("*.html") if p.name != "index.html"}
 
 
 def ensure_topic_file(topic: str) -> Path:
@@ -513,110 +951,110 @@ def ensure_topic_file(topic: str) -> Path:
     topic_info = DEVOPS_TOPICS.get(topic, DEVOPS_TOPICS["misc"])
     topic_file = TOPICS_DIR / f"{topic}.html"
 
-    if not topic_file.exists():
+    if topic_file not in _scan_topic_files() and not topic_file.exists():
         # Create new topic file with template
         template = generate_topic_template(topic, topic_info)
         with open(topic_file, 'w', encoding='utf-8') as f:
             f.write(template)
         print(f"   📁 Created new topic file: {topic}.html")
 
+    _scan_topic_files().add(topic_file)
     return topic_file
 
 
-def generate_topic_template(topic: str, topic_info: dict) -> str:
-    """Generate HTML template for a new topic file"""
-
-    return f'''<!DOCTYPE html>
+# New-topic page skeleton; string.Template so the static HTML/CSS isn't
+# re-parsed as an f-string (and braces don't need doubling)
+_TOPIC_TPL = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{topic_info['icon']} {topic_info['name']} - DevOps Learning</title>
+    <title>${icon} ${name} - DevOps Learning</title>
     <link href="https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/themes/prism-tomorrow.min.css" rel="stylesheet" />
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        :root {{
-            --primary: {topic_info['color']};
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        :root {
+            --primary: ${primary};
             --dark: #2d3748;
             --light: #f7fafc;
             --code-bg: #1e1e1e;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             line-height: 1.6;
             color: var(--dark);
             background: var(--light);
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, var(--primary) 0%, #333 100%);
             color: white;
             padding: 2rem;
             text-align: center;
-        }}
-        .header h1 {{ font-size: 2.5rem; margin-bottom: 0.5rem; }}
-        .container {{ max-width: 1000px; margin: 0 auto; padding: 2rem; }}
-        .section {{
+        }
+        .header h1 { font-size: 2.5rem; margin-bottom: 0.5rem; }
+        .container { max-width: 1000px; margin: 0 auto; padding: 2rem; }
+        .section {
             background: white;
             border-radius: 10px;
             padding: 1.5rem;
             margin-bottom: 1.5rem;
             box-shadow: 0 2px 10px rgba(0,0,0,0.05);
             border-left: 4px solid var(--primary);
-        }}
-        .section h2 {{ color: var(--primary); margin-bottom: 1rem; }}
-        .section h3 {{ color: var(--dark); margin: 1rem 0 0.5rem; }}
-        .section-meta {{ font-size: 0.85rem; color: #666; margin-bottom: 1rem; }}
-        pre {{
+        }
+        .section h2 { color: var(--primary); margin-bottom: 1rem; }
+        .section h3 { color: var(--dark); margin: 1rem 0 0.5rem; }
+        .section-meta { font-size: 0.85rem; color: #666; margin-bottom: 1rem; }
+        pre {
             background: var(--code-bg);
             border-radius: 8px;
             padding: 1rem;
             overflow-x: auto;
             margin: 1rem 0;
-        }}
-        code {{ font-family: 'Fira Code', monospace; font-size: 0.9rem; }}
-        .tip {{
+        }
+        code { font-family: 'Fira Code', monospace; font-size: 0.9rem; }
+        .tip {
             background: #e6f7ff;
             border-left: 4px solid #1890ff;
             padding: 1rem;
             margin: 1rem 0;
             border-radius: 5px;
-        }}
-        .tip::before {{ content: '💡 TIP: '; font-weight: bold; color: #1890ff; }}
-        .best-practice {{
+        }
+        .tip::before { content: '💡 TIP: '; font-weight: bold; color: #1890ff; }
+        .best-practice {
             background: #f0f9ff;
             border: 2px solid var(--primary);
             padding: 1rem;
             margin: 1rem 0;
             border-radius: 8px;
-        }}
-        .best-practice::before {{
+        }
+        .best-practice::before {
             content: '✅ BEST PRACTICE';
             display: block;
             font-weight: bold;
             color: var(--primary);
             margin-bottom: 0.5rem;
-        }}
-        table {{ width: 100%; border-collapse: collapse; margin: 1rem 0; }}
-        th {{ background: var(--primary); color: white; padding: 0.75rem; text-align: left; }}
-        td {{ padding: 0.75rem; border-bottom: 1px solid #e2e8f0; }}
-        tr:hover {{ background: var(--light); }}
-        ul {{ margin: 0.5rem 0 0.5rem 1.5rem; }}
-        .back-link {{
+        }
+        table { width: 100%; border-collapse: collapse; margin: 1rem 0; }
+        th { background: var(--primary); color: white; padding: 0.75rem; text-align: left; }
+        td { padding: 0.75rem; border-bottom: 1px solid #e2e8f0; }
+        tr:hover { background: var(--light); }
+        ul { margin: 0.5rem 0 0.5rem 1.5rem; }
+        .back-link {
             display: inline-block;
             margin: 1rem 0;
             color: var(--primary);
             text-decoration: none;
-        }}
-        .back-link:hover {{ text-decoration: underline; }}
-        @media (max-width: 768px) {{
-            .header h1 {{ font-size: 1.8rem; }}
-            .container {{ padding: 1rem; }}
-        }}
+        }
+        .back-link:hover { text-decoration: underline; }
+        @media (max-width: 768px) {
+            .header h1 { font-size: 1.8rem; }
+            .container { padding: 1rem; }
+        }
     </style>
 </head>
 <body>
     <div class="header">
-        <h1>{topic_info['icon']} {topic_info['name']}</h1>
+        <h1>${icon} ${name}</h1>
         <p>DevOps Learning Notes</p>
     </div>
 
@@ -635,14 +1073,25 @@ def generate_topic_template(topic: str, topic_info: dict) -> str:
     <script src="https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/components/prism-json.min.js"></script>
 </body>
 </html>
-'''
+''')
+
+
+def generate_topic_template(topic: str, topic_info: dict) -> str:
+    """Generate HTML template for a new topic file"""
+
+    return _TOPIC_TPL.substitute(
+        icon=topic_info['icon'],
+        name=topic_info['name'],
+        primary=topic_info['color'],
+    )
 
 
-def generate_section_html(analysis: dict, topic: str) -> str:
+def generate_section_html(analysis: dict, topic: str, timestamp: str = None) -> str:
     """Generate HTML section from analysis"""
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    section_id = hashlib.md5(f"{analysis.get('title', '')}{timestamp}".encode()).hexdigest()[:8]
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    section_id = fast_hash(f"{analysis.get('title', '')}{timestamp}")
 
     title = analysis.get('title', 'New Learning')
     summary = analysis.get('summary', '')
@@ -652,80 +1101,121 @@ def generate_section_html(analysis: dict, topic: str) -> str:
     commands = analysis.get('commands', [])
     best_practices = analysis.get('best_practices', [])
 
-    html = f'''
+    # Build from a parts list and join once; += in loops copies the whole string
+    parts = [f'''
         <section id="section-{section_id}" class="section">
             <h2>{title}</h2>
             <p class="section-meta">Added: {timestamp}</p>
             <p>{summary}</p>
-'''
+''']
 
     if key_points:
-        html += '            <h3>Key Points</h3>\n            <ul>\n'
+        parts.append('            <h3>Key Points</h3>\n            <ul>\n')
         for point in key_points:
-            html += f'                <li>{point}</li>\n'
-        html += '            </ul>\n'
+            parts.append(f'                <li>{point}</li>\n')
+        parts.append('            </ul>\n')
 
     if code_examples:
-        html += '            <h3>Code Examples</h3>\n'
+        parts.append('            <h3>Code Examples</h3>\n')
         for example in code_examples:
             lang = example.get('language', 'bash')
-            code = example.get('code', '').replace('<', '&lt;').replace('>', '&gt;')
+            code = html_escape(example.get('code', ''), quote=False)
             desc = example.get('description', '')
-            html += f'''            <p><strong>{desc}</strong></p>
+            parts.append(f'''            <p><strong>{desc}</strong></p>
             <pre><code class="language-{lang}">{code}</code></pre>
-'''
+''')
 
     if commands:
-        html += '''            <h3>Commands</h3>
+        parts.append('''            <h3>Commands</h3>
             <table>
                 <tr><th>Command</th><th>Description</th></tr>
-'''
+''')
         for cmd in commands:
-            cmd_text = cmd.get('command', '').replace('<', '&lt;').replace('>', '&gt;')
-            html += f'''                <tr>
+            cmd_text = html_escape(cmd.get('command', ''), quote=False)
+            parts.append(f'''                <tr>
                     <td><code>{cmd_text}</code></td>
                     <td>{cmd.get('description', '')}</td>
                 </tr>
-'''
-        html += '            </table>\n'
+''')
+        parts.append('            </table>\n')
 
     if tips:
         for tip in tips:
-            html += f'            <div class="tip">{tip}</div>\n'
+            parts.append(f'            <div class="tip">{tip}</div>\n')
 
     if best_practices:
-        html += '            <div class="best-practice">\n'
+        parts.append('            <div class="best-practice">\n')
         for practice in best_practices:
-            html += f'                <p>• {practice}</p>\n'
-        html += '            </div>\n'
+            parts.append(f'                <p>• {practice}</p>\n')
+        parts.append('            </div>\n')
 
-    html += '        </section>\n'
-    return html
+    parts.append('        </section>\n')
+    return "".join(parts)
 
 
-def update_topic_file(topic: str, sections: List[dict]) -> Path:
-    """Update topic file with new sections"""
+# Sections are appended in front of this marker; its byte offset per topic is
+# cached so appends stop re-reading and rewriting ever-growing topic files.
+# The offsets are per-machine scratch state, so they live in the cache dir
+# instead of being committed with the topic pages; a stale offset just fails
+# the marker check below and falls back to a scan
+CONTENT_MARKER = "<!-- CONTENT_MARKER -->"
+OFFSETS_FILE = CACHE_DIR / "topic_offsets.json"
 
-    topic_file = ensure_topic_file(topic)
 
-    with open(topic_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+def _load_marker_offsets() -> dict:
+    if OFFSETS_FILE.exists():
+        try:
+            with open(OFFSETS_FILE, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {}
 
-    # Generate HTML for all sections
-    new_content = ""
-    for section in sections:
-        new_content += generate_section_html(section, topic)
 
-    # Insert before marker
-    marker = "<!-- CONTENT_MARKER -->"
-    if marker in content:
-        content = content.replace(marker, f"{new_content}\n        {marker}")
-    else:
-        # Fallback: insert before </main>
-        content = content.replace("</main>", f"{new_content}\n        </main>")
+def _save_marker_offsets(offsets: dict):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(OFFSETS_FILE, 'w') as f:
+        json.dump(offsets, f, indent=2)
 
-    with open(topic_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+
+def update_topic_file(topic: str, sections: List[dict]) -> Path:
+    """Append new sections to a topic file by splicing at the cached marker offset"""
+
+    topic_file = ensure_topic_file(topic)
+
+    # All sections from this ingest land in a single write; the timestamp is
+    # formatted once per ingest instead of once per section
+    stamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    new_content = "".join([generate_section_html(section, topic, stamp) for section in sections])
+    payload = f"{new_content}\n        ".encode('utf-8')
+
+    marker = CONTENT_MARKER.encode('utf-8')
+    offsets = _load_marker_offsets()
+    offset = offsets.get(topic, -1)
+
+    with open(topic_file, 'r+b') as f:
+        # Trust the cached offset only if the marker is still there
+        if offset >= 0:
+            f.seek(offset)
+            if f.read(len(marker)) != marker:
+                offset = -1
+        if offset < 0:
+            f.seek(0)
+            data = f.read()
+            offset = data.find(marker)
+            if offset < 0:
+                # No marker (hand-edited file): insert before </main>
+                offset = data.find(b"</main>")
+                if offset < 0:
+                    offset = len(data)
+
+        f.seek(offset)
+        tail = f.read()
+        f.seek(offset)
+        f.write(payload + tail)
+
+    offsets[topic] = offset + len(payload)
+    _save_marker_offsets(offsets)
 
     return topic_file
 
@@ -733,30 +1223,31 @@ def update_topic_file(topic: str, sections: List[dict]) -> Path:
 def update_index_html():
     """Update index.html with links to all topic files"""
 
-    # Find all topic files
-    topic_files = list(TOPICS_DIR.glob("*.html")) if TOPICS_DIR.exists() else []
+    # Find all topic files (registry filled at startup, extended by ensure_topic_file)
+    topic_files = _scan_topic_files()
 
-    # Generate topic cards
-    topic_cards = ""
+    # Generate topic cards (parts list + join, not += per card)
+    card_parts = []
     for topic_file in sorted(topic_files):
         topic_key = topic_file.stem
         if topic_key in DEVOPS_TOPICS:
             info = DEVOPS_TOPICS[topic_key]
-            topic_cards += f'''
+            card_parts.append(f'''
             <a href="topics/{topic_key}.html" class="topic-card" style="border-color: {info['color']}">
                 <span class="topic-icon">{info['icon']}</span>
                 <span class="topic-name">{info['name']}</span>
             </a>
-'''
+''')
+    topic_cards = "".join(card_parts)
 
     # Also include existing HTML files in root
-    existing_files = ""
-    for html_file in REPO_PATH.glob("*.html"):
-        if html_file.name not in ["index.html"]:
-            name = html_file.stem.replace("_", " ").replace("-", " ").title()
-            existing_files += f'''
+    file_parts = []
+    for html_file in sorted(_scan_root_files()):
+        name = html_file.stem.replace("_", " ").replace("-", " ").title()
+        file_parts.append(f'''
             <a href="{html_file.name}" class="file-link">📄 {name}</a>
-'''
+''')
+    existing_files = "".join(file_parts)
 
     # Generate new index.html
     index_content = f'''<!DOCTYPE html>
@@ -967,6 +1458,8 @@ Examples:
     parser.add_argument('--search', help='Search existing notes')
     parser.add_argument('--no-push', action='store_true', help='Do not push to GitHub')
     parser.add_argument('--dry-run', action='store_true', help='Analyze only')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_REQUESTS,
+                        help=f'Parallel OpenAI requests (default: {MAX_CONCURRENT_REQUESTS})')
 
     args = parser.parse_args()
 
@@ -986,7 +1479,10 @@ Examples:
         print(f"\n📄 Reading file: {args.file}")
         content, file_type = read_file_content(args.file)
         source = Path(args.file).name
-        print(f"   ✅ Extracted {len(content):,} characters")
+        if isinstance(content, str):
+            print(f"   ✅ Extracted {len(content):,} characters")
+        else:
+            print(f"   🌊 Streaming content (file too large to hold in memory)")
     elif args.interactive:
         content = interactive_input()
         source = "interactive"
@@ -997,7 +1493,7 @@ Examples:
         print("\n❌ Please provide content, file, or use -i for interactive mode")
         sys.exit(1)
 
-    if not content or len(content.strip()) < 10:
+    if isinstance(content, str) and (not content or len(content.strip()) < 10):
         print("❌ Content too short")
         sys.exit(1)
 
@@ -1011,10 +1507,10 @@ Examples:
         # Find matching topic or create new one
         topic_key = find_or_create_topic(args.topic)
         # Process content for this specific topic
-        results = process_for_specific_topic(client, content, topic_key)
+        results = process_for_specific_topic(client, content, topic_key, max_workers=args.concurrency)
     else:
         # Auto-detect topics (original behavior)
-        results = process_large_content(client, content)
+        results = process_large_content(client, content, max_workers=args.concurrency)
 
     if args.dry_run:
         print("\n🔍 Dry run - results:")